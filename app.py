@@ -8,10 +8,11 @@ Run: streamlit run app.py
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
-import seaborn as sns
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 import os
+from string import Template
 
 # ─── PAGE CONFIG ─────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -32,9 +33,9 @@ st.markdown("""
 # Top Navbar
 col_spacer1, col_nav1, col_nav2, col_spacer2 = st.columns([3, 2, 2, 3])
 with col_nav1:
-    st.page_link("app.py", label="Dashboard", use_container_width=True)
+    st.page_link("app.py", label="Dashboard", width='stretch')
 with col_nav2:
-    st.page_link("pages/1_About.py", label="About the Project", use_container_width=True)
+    st.page_link("pages/1_About.py", label="About the Project", width='stretch')
 
 # ─── CUSTOM CSS ─────────────────────────────────────────────────────────────
 st.markdown("""
@@ -83,25 +84,337 @@ st.markdown("""
 PALETTE = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#44BBA4',
            '#6A994E', '#E94F37', '#393E41', '#D4A373', '#3B1F2B']
 
+# KPI card row, parsed once at import and filled per rerun
+METRIC_TPL = Template("""
+<div class="metric-row">
+    <div class="metric-card">
+        <div class="metric-label">Total Revenue</div>
+        <div class="metric-value">£$total_revenue</div>
+    </div>
+    <div class="metric-card">
+        <div class="metric-label">Total Orders</div>
+        <div class="metric-value">$total_orders</div>
+    </div>
+    <div class="metric-card">
+        <div class="metric-label">Customers</div>
+        <div class="metric-value">$total_customers</div>
+    </div>
+    <div class="metric-card">
+        <div class="metric-label">Avg Order Value</div>
+        <div class="metric-value">£$aov</div>
+    </div>
+    <div class="metric-card">
+        <div class="metric-label">Latest MoM Growth</div>
+        <div class="metric-value">$latest_growth%</div>
+        <div class="metric-delta $delta_class">$delta_arrow vs prev month</div>
+    </div>
+    <div class="metric-card">
+        <div class="metric-label">Repeat Rate</div>
+        <div class="metric-value">$repeat_rate%</div>
+    </div>
+</div>
+""")
+
 
 # ─── DATA LOADING ────────────────────────────────────────────────────────────
-@st.cache_data
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data', 'cleaned')
+# Only the transaction columns the dashboard actually reads
+TXN_COLUMNS = ['InvoiceDate', 'Country', 'Customer ID', 'Invoice', 'Revenue',
+               'YearMonth', 'Quarter', 'Hour', 'DayOfWeek', 'Description']
+
+
+# Shared read-only across reruns and sessions (cache_resource hands back the same
+# objects instead of unpickling a fresh copy) — never mutate df_full / rfm_full.
+@st.cache_resource
 def load_data():
-    base = os.path.dirname(__file__)
-    df = pd.read_csv(os.path.join(base, 'data', 'cleaned', 'retail_cleaned.csv'), parse_dates=['InvoiceDate'])
-    rfm = pd.read_csv(os.path.join(base, 'data', 'cleaned', 'rfm_data.csv'))
+    # Prefer the typed Parquet copies written next to the CSVs by the pipeline, fall back to CSV
+    txn_parquet = os.path.join(DATA_DIR, 'retail_cleaned.parquet')
+    rfm_parquet = os.path.join(DATA_DIR, 'rfm_data.parquet')
+    if os.path.exists(txn_parquet):
+        df = pd.read_parquet(txn_parquet, engine='pyarrow', columns=TXN_COLUMNS)
+    else:
+        df = pd.read_csv(os.path.join(DATA_DIR, 'retail_cleaned.csv'), usecols=TXN_COLUMNS, parse_dates=['InvoiceDate'])
+    if os.path.exists(rfm_parquet):
+        rfm = pd.read_parquet(rfm_parquet, engine='pyarrow')
+    else:
+        rfm = pd.read_csv(os.path.join(DATA_DIR, 'rfm_data.csv'))
+    # Keep transactions in time order so a date range is a contiguous slice
+    df = df.sort_values('InvoiceDate', kind='stable').reset_index(drop=True)
+    # Calendar day, computed once, so date-range bounds need no per-row .dt.date
+    df['InvoiceDay'] = df['InvoiceDate'].dt.floor('D')
+    # Low-cardinality string columns → category, so groupby/isin work on int codes
+    for col in ['Country', 'Description', 'Quarter', 'YearMonth']:
+        df[col] = df[col].astype('category')
+    df['DayOfWeek'] = df['DayOfWeek'].astype(pd.CategoricalDtype(DAY_ORDER, ordered=True))
+    # 32-bit numerics halve the bytes every sum / groupby has to move
+    df['Revenue'] = df['Revenue'].astype('float32')
+    df['Customer ID'] = df['Customer ID'].astype('int32')
+    # Invoice ids are text (e.g. 'C'-prefixed); int32 codes keep every id distinct
+    df['Invoice'] = pd.factorize(df['Invoice'])[0].astype('int32')
+    df['Hour'] = df['Hour'].astype('int8')
+    if 'Segment' in rfm.columns:
+        rfm['Segment'] = rfm['Segment'].astype('category')
+    rfm['Monetary'] = rfm['Monetary'].astype('float32')
+    # Sorted CustomerID index turns the per-filter customer lookup into an index join
+    rfm = rfm.set_index('CustomerID').sort_index()
     return df, rfm
 
 df_full, rfm_full = load_data()
 
 
+def slice_dates(frame, date_range):
+    """Rows of a day-sorted frame whose InvoiceDay falls inside date_range (inclusive)."""
+    if len(date_range) != 2:
+        return frame
+    days = frame['InvoiceDay'].values
+    lo = np.searchsorted(days, np.datetime64(date_range[0]), side='left')
+    hi = np.searchsorted(days, np.datetime64(date_range[1]), side='right')
+    return frame.iloc[lo:hi]
+
+
+@st.cache_resource(show_spinner=False)
+def load_revenue_cube():
+    """Revenue pre-aggregated to one row per (day, country, hour), sorted by day.
+
+    Every revenue chart only needs date, country and a time bucket, so after the
+    same date/country filter they are answered from this small table (tens of
+    thousands of rows) instead of the full transaction frame.
+    """
+    df_full, _ = load_data()
+    cube = (df_full.assign(Revenue=df_full['Revenue'].astype('float64'))
+            .groupby(['InvoiceDay', 'Country', 'Hour'], observed=True, sort=True)
+            .agg(Revenue=('Revenue', 'sum'), YearMonth=('YearMonth', 'first'),
+                 Quarter=('Quarter', 'first'), DayOfWeek=('DayOfWeek', 'first'))
+            .reset_index())
+    return cube
+
+
+def category_mask(frame, col, values):
+    """Boolean row mask for frame[col] in values, via a lookup table over the category codes."""
+    column = frame[col]
+    # One spare slot at the end so missing values (code -1) land on False
+    lut = np.zeros(len(column.cat.categories) + 1, dtype=bool)
+    lut[column.cat.categories.get_indexer(list(values))] = True
+    lut[-1] = False
+    return lut[column.cat.codes.values]
+
+
+def sum_by_category(df, col, value='Revenue'):
+    """Sum ``value`` per category of ``col`` with one bincount over the codes.
+
+    Categories come back in category order (chronological for YearMonth);
+    categories with no rows in ``df`` are dropped.
+    """
+    cat = df[col].cat
+    codes = cat.codes.to_numpy()
+    n = len(cat.categories)
+    sums = np.bincount(codes, weights=df[value].to_numpy(), minlength=n)
+    present = np.bincount(codes, minlength=n) > 0
+    return pd.Series(sums[present], index=cat.categories[present], name=value)
+
+
+@st.cache_data(show_spinner=False)
+def compute_aggregates(date_range, countries, segments):
+    """Filter once and build every KPI / chart aggregate for one filter state.
+
+    Keyed on the (hashable) filter tuple, so reruns that don't touch the
+    filters only read back a handful of small Series. ``countries`` is None
+    when every country is selected, which skips the country filter entirely.
+    """
+    df_full, rfm_full = load_data()
+
+    df = slice_dates(df_full, date_range)
+    cube = slice_dates(load_revenue_cube(), date_range)
+    if countries is not None:
+        df = df[category_mask(df, 'Country', countries)]
+        cube = cube[category_mask(cube, 'Country', countries)]
+    if len(df) == 0:
+        return None
+
+    # ── KPIs ──
+    total_revenue = cube['Revenue'].sum()
+    # Every invoice belongs to one customer, so the customer of each invoice's first line
+    # gives orders per customer — customer count, repeat rate and the RFM lookup — without nunique
+    order_customers = df['Customer ID'][~df['Invoice'].duplicated()]
+    total_orders = len(order_customers)
+    purchase_counts = order_customers.value_counts(sort=False)
+    total_customers = len(purchase_counts)
+    aov = total_revenue / total_orders if total_orders > 0 else 0
+
+    monthly = sum_by_category(cube, 'YearMonth')
+    latest_growth = (monthly.iloc[-1] - monthly.iloc[-2]) / monthly.iloc[-2] * 100 if len(monthly) >= 2 else 0
+
+    repeat_rate = (purchase_counts > 1).mean() * 100
+
+    # ── Segments (restricted to customers in the filtered transactions) ──
+    filtered_customers = purchase_counts.index
+    rfm_by_country = rfm_full.loc[rfm_full.index.intersection(filtered_customers)]
+    rfm_filtered = rfm_by_country
+
+    missing_segments = []
+    if segments:
+        # Segments present before the segment filter, reused for the "missing" notice
+        available = set(rfm_by_country['Segment'].unique())
+        missing_segments = sorted(set(segments) - available)
+        if len(segments) < len(rfm_full['Segment'].cat.categories):
+            rfm_filtered = rfm_by_country[rfm_by_country['Segment'].isin(segments)]
+
+    return {
+        'kpis': {
+            'total_revenue': total_revenue,
+            'total_orders': total_orders,
+            'total_customers': total_customers,
+            'aov': aov,
+            'latest_growth': latest_growth,
+            'repeat_rate': repeat_rate,
+            'start': df['InvoiceDate'].min(),
+            'end': df['InvoiceDate'].max(),
+            'countries': df['Country'].nunique(),
+        },
+        'monthly': monthly,
+        'quarterly': sum_by_category(cube, 'Quarter'),
+        'hourly': cube.groupby('Hour', sort=False)['Revenue'].sum().sort_index(),
+        'daily': sum_by_category(cube, 'DayOfWeek').reindex(DAY_ORDER).fillna(0),
+        'top_products': df.groupby('Description', observed=True, sort=False)['Revenue'].sum().nlargest(10).sort_values(),
+        'top_countries': sum_by_category(cube, 'Country').nlargest(10).sort_values(),
+        'seg_counts': rfm_filtered.groupby('Segment', observed=True, sort=False).size().sort_values(ascending=False),
+        'seg_revenue': rfm_filtered.groupby('Segment', observed=True, sort=False)['Monetary'].sum().sort_values(ascending=True),
+        'missing_segments': missing_segments,
+    }
+
+
+# ─── CHART BUILDERS ──────────────────────────────────────────────────────────
+# Each builder is cached on its small input Series, so a rerun with unchanged
+# aggregates reuses the finished figure. Plotly ships the figure as JSON and
+# the browser redraws it, so zoom/hover never round-trip to the server.
+CHART_H = 400        # standard chart height (px) for line/bar rows
+CHART_H_BARH = 440   # standard chart height (px) for horizontal-bar rows
+
+
+@st.cache_resource
+def dashboard_template():
+    """Static chart styling, built once per server process.
+
+    Everything that never changes with the filters (background, margins,
+    title placement, legend) lives here, so each rerun only supplies the
+    traces, title and height of a figure.
+    """
+    template = go.layout.Template(pio.templates['plotly_white'])
+    template.layout.update(
+        title={'x': 0.5, 'xanchor': 'center', 'font': {'size': 16}},
+        margin={'l': 10, 'r': 10, 't': 50, 'b': 10},
+        plot_bgcolor='#FAFAFA', showlegend=False
+    )
+    return template
+
+
+def style_fig(fig, title, height=CHART_H, money_axis='y'):
+    fig.update_layout(template=dashboard_template(), title_text=title, height=height,
+                      xaxis_title=None, yaxis_title=None)
+    if money_axis:
+        fig.update_layout({f'{money_axis}axis': {'tickprefix': '£', 'tickformat': ',.0f'}})
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def build_monthly_chart(monthly):
+    fig = px.line(x=monthly.index.astype(str), y=monthly.values, markers=True, render_mode='webgl')
+    fig.update_traces(line={'color': '#2E86AB', 'width': 2.5}, marker={'size': 5},
+                      fill='tozeroy', fillcolor='rgba(46,134,171,0.2)',
+                      hovertemplate='%{x}<br>£%{y:,.0f}<extra></extra>')
+    fig.update_xaxes(tickangle=-45)
+    return style_fig(fig, 'Monthly Revenue')
+
+
+@st.cache_data(show_spinner=False)
+def build_quarterly_chart(quarterly):
+    fig = px.bar(x=quarterly.index.astype(str), y=quarterly.values)
+    fig.update_traces(marker_color='#A23B72', width=0.5,
+                      hovertemplate='%{x}<br>£%{y:,.0f}<extra></extra>')
+    fig.update_xaxes(tickangle=-45)
+    return style_fig(fig, 'Quarterly Revenue')
+
+
+@st.cache_data(show_spinner=False)
+def build_segment_pie(seg_counts):
+    if len(seg_counts) == 0:
+        fig = go.Figure()
+        fig.add_annotation(text='No segment data', showarrow=False, font={'size': 16, 'color': '#999'})
+        fig.update_xaxes(visible=False); fig.update_yaxes(visible=False)
+        return style_fig(fig, 'RFM Customer Segments', CHART_H_BARH, money_axis=None)
+    colors_seg = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#44BBA4', '#6A994E', '#E94F37']
+    fig = px.pie(names=seg_counts.index.astype(str), values=seg_counts.values, hole=0.45,
+                 color_discrete_sequence=colors_seg)
+    fig.update_traces(textinfo='percent', textfont={'color': 'white', 'size': 11},
+                      marker={'line': {'color': 'white', 'width': 1.5}}, sort=False, rotation=140)
+    fig = style_fig(fig, 'RFM Customer Segments', CHART_H_BARH, money_axis=None)
+    fig.update_layout(showlegend=True)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def build_segment_revenue_chart(seg_revenue):
+    fig = px.bar(x=seg_revenue.values, y=seg_revenue.index.astype(str), orientation='h')
+    fig.update_traces(marker_color='#A23B72', width=0.5,
+                      hovertemplate='%{y}<br>£%{x:,.0f}<extra></extra>')
+    return style_fig(fig, 'Revenue by Segment', CHART_H_BARH, money_axis='x')
+
+
+@st.cache_data(show_spinner=False)
+def build_top_products_chart(top_products):
+    labels = [d[:30] for d in top_products.index]
+    fig = px.bar(x=top_products.values, y=labels, orientation='h')
+    fig.update_traces(marker_color='#F18F01', width=0.5,
+                      hovertemplate='%{y}<br>£%{x:,.0f}<extra></extra>')
+    return style_fig(fig, 'Top 10 Products by Revenue', CHART_H_BARH, money_axis='x')
+
+
+@st.cache_data(show_spinner=False)
+def build_top_countries_chart(top_countries):
+    colors_c = ['#C73E1D' if c == 'United Kingdom' else '#2E86AB' for c in top_countries.index]
+    fig = px.bar(x=top_countries.values, y=top_countries.index.astype(str), orientation='h')
+    fig.update_traces(marker_color=colors_c, width=0.5,
+                      hovertemplate='%{y}<br>£%{x:,.0f}<extra></extra>')
+    return style_fig(fig, 'Top 10 Countries by Revenue', CHART_H_BARH, money_axis='x')
+
+
+@st.cache_data(show_spinner=False)
+def build_hourly_chart(hourly):
+    fig = px.bar(x=hourly.index, y=hourly.values)
+    fig.update_traces(marker_color='#44BBA4', width=0.7,
+                      hovertemplate='%{x}:00<br>£%{y:,.0f}<extra></extra>')
+    fig.update_xaxes(tickmode='linear', tick0=0, dtick=1, range=[-0.5, 23.5], title_text='Hour')
+    return style_fig(fig, 'Revenue by Hour')
+
+
+@st.cache_data(show_spinner=False)
+def build_daily_chart(daily):
+    fig = px.bar(x=daily.index.astype(str), y=daily.values)
+    fig.update_traces(marker_color='#E94F37', width=0.5,
+                      hovertemplate='%{x}<br>£%{y:,.0f}<extra></extra>')
+    fig.update_xaxes(tickangle=-30)
+    return style_fig(fig, 'Revenue by Day of Week')
+
+
 # ─── SIDEBAR FILTERS ────────────────────────────────────────────────────────
+@st.cache_resource
+def get_filter_options():
+    """Date bounds and the country / segment choices, computed once per server."""
+    df_full, rfm_full = load_data()
+    all_segments = rfm_full['Segment'].cat.categories.tolist() if 'Segment' in rfm_full.columns else []
+    return (df_full['InvoiceDate'].min().date(), df_full['InvoiceDate'].max().date(),
+            df_full['Country'].cat.categories.tolist(), all_segments)
+
+
+min_date, max_date, all_countries, all_segments = get_filter_options()
+
 st.sidebar.markdown("# Filters")
 st.sidebar.markdown("---")
 
 # Date range filter
-min_date = df_full['InvoiceDate'].min().date()
-max_date = df_full['InvoiceDate'].max().date()
 date_range = st.sidebar.date_input(
     "Date Range",
     value=(min_date, max_date),
@@ -110,7 +423,6 @@ date_range = st.sidebar.date_input(
 )
 
 # Country filter
-all_countries = sorted(df_full['Country'].unique())
 selected_countries = st.sidebar.multiselect(
     "Countries",
     all_countries,
@@ -118,10 +430,8 @@ selected_countries = st.sidebar.multiselect(
 )
 
 # Segment filter
-all_segments = []
 selected_segments = []
-if 'Segment' in rfm_full.columns:
-    all_segments = sorted(rfm_full['Segment'].unique())
+if all_segments:
     selected_segments = st.sidebar.multiselect(
         "Customer Segments",
         all_segments,
@@ -132,82 +442,43 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("*Built with Python, Pandas & Streamlit*")
 
 # ─── APPLY FILTERS ──────────────────────────────────────────────────────────
-if len(date_range) == 2:
-    df = df_full[(df_full['InvoiceDate'].dt.date >= date_range[0]) &
-                  (df_full['InvoiceDate'].dt.date <= date_range[1])]
-else:
-    df = df_full.copy()
-
-df = df[df['Country'].isin(selected_countries)]
+# An all-countries selection needs no filtering at all, so pass None for it
+countries_key = None if set(selected_countries) == set(all_countries) else tuple(sorted(selected_countries))
+agg = compute_aggregates(tuple(date_range), countries_key, tuple(sorted(selected_segments)))
 
 
 # ─── HEADER ────────────────────────────────────────────────────────────────
 st.markdown('<div class="dashboard-title">E-Commerce Sales Intelligence Dashboard</div>', unsafe_allow_html=True)
 st.markdown('<div class="dashboard-subtitle">UCI Online Retail II | {start} to {end} | {countries} countries</div>'.format(
-    start=df['InvoiceDate'].min().strftime('%b %Y') if len(df) > 0 else 'N/A',
-    end=df['InvoiceDate'].max().strftime('%b %Y') if len(df) > 0 else 'N/A',
-    countries=df['Country'].nunique()
+    start=agg['kpis']['start'].strftime('%b %Y') if agg else 'N/A',
+    end=agg['kpis']['end'].strftime('%b %Y') if agg else 'N/A',
+    countries=agg['kpis']['countries'] if agg else 0
 ), unsafe_allow_html=True)
 
 
 # ─── KPI CARDS ───────────────────────────────────────────────────────────────
-if len(df) > 0:
-    total_revenue = df['Revenue'].sum()
-    total_orders = df['Invoice'].nunique()
-    total_customers = df['Customer ID'].nunique()
-    aov = total_revenue / total_orders if total_orders > 0 else 0
-    
-    monthly_rev = df.groupby('YearMonth')['Revenue'].sum().sort_index()
-    latest_growth = (monthly_rev.iloc[-1] - monthly_rev.iloc[-2]) / monthly_rev.iloc[-2] * 100 if len(monthly_rev) >= 2 else 0
-    
-    purchase_counts = df.groupby('Customer ID')['Invoice'].nunique()
-    repeat_rate = (purchase_counts > 1).sum() / len(purchase_counts) * 100
+if agg:
+    kpis = agg['kpis']
+    total_revenue = kpis['total_revenue']
+    total_orders = kpis['total_orders']
+    total_customers = kpis['total_customers']
+    aov = kpis['aov']
+    latest_growth = kpis['latest_growth']
+    repeat_rate = kpis['repeat_rate']
 
     delta_class = 'positive' if latest_growth >= 0 else 'negative'
     delta_arrow = '↑' if latest_growth >= 0 else '↓'
 
-    st.markdown(f"""
-    <div class="metric-row">
-        <div class="metric-card">
-            <div class="metric-label">Total Revenue</div>
-            <div class="metric-value">£{total_revenue:,.0f}</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-label">Total Orders</div>
-            <div class="metric-value">{total_orders:,}</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-label">Customers</div>
-            <div class="metric-value">{total_customers:,}</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-label">Avg Order Value</div>
-            <div class="metric-value">£{aov:,.0f}</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-label">Latest MoM Growth</div>
-            <div class="metric-value">{latest_growth:+.1f}%</div>
-            <div class="metric-delta {delta_class}">{delta_arrow} vs prev month</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-label">Repeat Rate</div>
-            <div class="metric-value">{repeat_rate:.1f}%</div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # ─── CHART HELPER ───────────────────────────────────────────────────────
-    CHART_H = 5          # standard chart height for line/bar rows
-    CHART_H_BARH = 5.5   # standard chart height for horizontal-bar rows
-
-    def style_ax(ax, title, grid_axis='y'):
-        ax.set_title(title, fontsize=14, pad=10)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['bottom'].set_color('#ddd')
-        ax.spines['left'].set_color('#ddd')
-        ax.tick_params(colors='#333')
-        ax.grid(alpha=0.15, color='#999', axis=grid_axis)
+    st.markdown(METRIC_TPL.substitute(
+        total_revenue=f"{total_revenue:,.0f}",
+        total_orders=f"{total_orders:,}",
+        total_customers=f"{total_customers:,}",
+        aov=f"{aov:,.0f}",
+        latest_growth=f"{latest_growth:+.1f}",
+        delta_class=delta_class,
+        delta_arrow=delta_arrow,
+        repeat_rate=f"{repeat_rate:.1f}",
+    ), unsafe_allow_html=True)
 
     # ─── ROW 1: Revenue Trends ──────────────────────────────────────────────
     st.markdown('<div class="section-header">Revenue Trends</div>', unsafe_allow_html=True)
@@ -215,76 +486,25 @@ if len(df) > 0:
     col_left, col_right = st.columns(2)
 
     with col_left:
-        monthly = df.groupby('YearMonth')['Revenue'].sum().reset_index().sort_values('YearMonth')
-        fig, ax = plt.subplots(figsize=(10, CHART_H))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        if len(monthly) > 0:
-            ax.fill_between(range(len(monthly)), monthly['Revenue'], alpha=0.2, color='#2E86AB')
-            ax.plot(range(len(monthly)), monthly['Revenue'], color='#2E86AB', linewidth=2.5, marker='o', markersize=4)
-            ax.set_xticks(range(len(monthly)))
-            ax.set_xticklabels(monthly['YearMonth'], rotation=45, ha='right', fontsize=8, color='#555')
-        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        style_ax(ax, 'Monthly Revenue', 'both')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_monthly_chart(agg['monthly']), width='stretch')
 
     with col_right:
-        quarterly = df.groupby('Quarter')['Revenue'].sum().reset_index().sort_values('Quarter')
-        fig, ax = plt.subplots(figsize=(10, CHART_H))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        if len(quarterly) > 0:
-            ax.bar(quarterly['Quarter'], quarterly['Revenue'], color='#A23B72', width=0.5, edgecolor='none')
-            ax.set_xticklabels(quarterly['Quarter'], rotation=45, ha='right', fontsize=8, color='#555')
-        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        style_ax(ax, 'Quarterly Revenue')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_quarterly_chart(agg['quarterly']), width='stretch')
 
     # ─── ROW 2: Customer Intelligence ───────────────────────────────────────
     st.markdown('<div class="section-header">Customer Intelligence</div>', unsafe_allow_html=True)
 
-    # Compute rfm_filtered ONCE for both charts in this row
-    filtered_customers = df['Customer ID'].unique()
-    rfm_filtered = rfm_full[rfm_full['CustomerID'].isin(filtered_customers)]
-    if selected_segments:
-        rfm_filtered = rfm_filtered[rfm_filtered['Segment'].isin(selected_segments)]
-    
     # Show info if some selected segments have no customers
-    if selected_segments:
-        available = set(rfm_full[rfm_full['CustomerID'].isin(filtered_customers)]['Segment'].unique())
-        missing = set(selected_segments) - available
-        if missing:
-            st.info(f"No customers found for: {', '.join(sorted(missing))} in the selected countries.")
+    if agg['missing_segments']:
+        st.info(f"No customers found for: {', '.join(agg['missing_segments'])} in the selected countries.")
 
     col_left, col_right = st.columns(2)
 
     with col_left:
-        seg_counts = rfm_filtered['Segment'].value_counts()
-        fig, ax = plt.subplots(figsize=(10, CHART_H_BARH))
-        fig.patch.set_facecolor('white')
-        if len(seg_counts) > 0:
-            colors_seg = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#44BBA4', '#6A994E', '#E94F37']
-            wedges, texts, autotexts = ax.pie(
-                seg_counts, labels=seg_counts.index, autopct='%1.1f%%',
-                colors=colors_seg[:len(seg_counts)], startangle=140,
-                pctdistance=0.75, labeldistance=1.18,
-                wedgeprops={'linewidth': 1.5, 'edgecolor': 'white'},
-                textprops={'fontsize': 9, 'color': '#333'})
-            for t in autotexts:
-                t.set_fontweight('bold'); t.set_fontsize(8); t.set_color('white')
-            ax.add_artist(plt.Circle((0, 0), 0.45, fc='white'))
-        else:
-            ax.text(0.5, 0.5, 'No segment data', ha='center', va='center', fontsize=14, color='#999', transform=ax.transAxes)
-        ax.set_title('RFM Customer Segments', fontsize=14, pad=15)
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_segment_pie(agg['seg_counts']), width='stretch')
 
     with col_right:
-        seg_revenue = rfm_filtered.groupby('Segment')['Monetary'].sum().sort_values(ascending=True)
-        fig, ax = plt.subplots(figsize=(10, CHART_H_BARH))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        if len(seg_revenue) > 0:
-            ax.barh(seg_revenue.index, seg_revenue.values, color='#A23B72', edgecolor='none', height=0.5)
-        ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        style_ax(ax, 'Revenue by Segment', 'x')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_segment_revenue_chart(agg['seg_revenue']), width='stretch')
 
     # ─── ROW 3: Product & Geographic ────────────────────────────────────────
     st.markdown('<div class="section-header">Products & Markets</div>', unsafe_allow_html=True)
@@ -292,28 +512,10 @@ if len(df) > 0:
     col_left, col_right = st.columns(2)
 
     with col_left:
-        top_products = df.groupby('Description')['Revenue'].sum().sort_values(ascending=False).head(10)
-        top_products = top_products.sort_values(ascending=True)
-        fig, ax = plt.subplots(figsize=(10, CHART_H_BARH))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        if len(top_products) > 0:
-            labels = [d[:30] for d in top_products.index]
-            ax.barh(labels, top_products.values, color='#F18F01', edgecolor='none', height=0.5)
-        ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        style_ax(ax, 'Top 10 Products by Revenue', 'x')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_top_products_chart(agg['top_products']), width='stretch')
 
     with col_right:
-        top_countries = df.groupby('Country')['Revenue'].sum().sort_values(ascending=False).head(10)
-        top_countries = top_countries.sort_values(ascending=True)
-        fig, ax = plt.subplots(figsize=(10, CHART_H_BARH))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        if len(top_countries) > 0:
-            colors_c = ['#C73E1D' if c == 'United Kingdom' else '#2E86AB' for c in top_countries.index]
-            ax.barh(top_countries.index, top_countries.values, color=colors_c, edgecolor='none', height=0.5)
-        ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        style_ax(ax, 'Top 10 Countries by Revenue', 'x')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_top_countries_chart(agg['top_countries']), width='stretch')
 
     # ─── ROW 4: Hourly & Day of Week ────────────────────────────────────────
     st.markdown('<div class="section-header">Temporal Patterns</div>', unsafe_allow_html=True)
@@ -321,36 +523,17 @@ if len(df) > 0:
     col_left, col_right = st.columns(2)
 
     with col_left:
-        hourly = df.groupby('Hour')['Revenue'].sum().reset_index()
-        fig, ax = plt.subplots(figsize=(10, CHART_H))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        if len(hourly) > 0:
-            ax.bar(hourly['Hour'], hourly['Revenue'], color='#44BBA4', width=0.7, edgecolor='none')
-        ax.set_xticks(range(0, 24))
-        ax.set_xticklabels([f'{h}' for h in range(24)], fontsize=8, color='#555')
-        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        ax.set_xlabel('Hour', color='#555')
-        style_ax(ax, 'Revenue by Hour')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_hourly_chart(agg['hourly']), width='stretch')
 
     with col_right:
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        daily = df.groupby('DayOfWeek')['Revenue'].sum().reindex(day_order).fillna(0).reset_index()
-        daily.columns = ['Day', 'Revenue']
-        fig, ax = plt.subplots(figsize=(10, CHART_H))
-        fig.patch.set_facecolor('white'); ax.set_facecolor('#FAFAFA')
-        ax.bar(daily['Day'], daily['Revenue'], color='#E94F37', width=0.5, edgecolor='none')
-        ax.set_xticklabels(daily['Day'], rotation=30, ha='right', fontsize=9, color='#555')
-        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
-        style_ax(ax, 'Revenue by Day of Week')
-        plt.tight_layout(); st.pyplot(fig); plt.close()
+        st.plotly_chart(build_daily_chart(agg['daily']), width='stretch')
 
     # ─── FOOTER ─────────────────────────────────────────────────────────────
     st.markdown("---")
     st.markdown("""
     <div style='text-align: center; color: #777; font-size: 12px; padding: 20px;'>
         E-Commerce Sales Intelligence Dashboard | Data: UCI Online Retail II | 
-        Built with Python, Pandas, Matplotlib & Streamlit
+        Built with Python, Pandas, Plotly & Streamlit
     </div>
     """, unsafe_allow_html=True)
 
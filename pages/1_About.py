@@ -1,4 +1,7 @@
 import streamlit as st
+import os
+
+CSS_PATH = os.path.join(os.path.dirname(__file__), '..', 'styles.css')
 
 st.set_page_config(
     page_title="About - E-Commerce Sales Intelligence",
@@ -6,99 +9,35 @@ st.set_page_config(
     layout="wide"
 )
 
-# Hide sidebar navigation completely & adjust top padding
-st.markdown("""
-<style>
-    [data-testid="stSidebarNav"] {display: none;}
-    .block-container {padding-top: 4rem;}
-    
-    /* Custom Typography and Colors */
-    h1, h2, h3 {
-        font-family: 'Inter', sans-serif;
-    }
-    .main-title {
-        background: -webkit-linear-gradient(45deg, #4F46E5, #0ea5e9);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 3.5rem;
-        font-weight: 800;
-        margin-bottom: 0rem;
-        padding-bottom: 0;
-    }
-    .subtitle {
-        color: #64748b;
-        font-size: 1.25rem;
-        font-weight: 500;
-        margin-top: 0;
-        margin-bottom: 2rem;
-    }
-    .feature-card {
-        background-color: #1e293b;
-        border: 1px solid #334155;
-        border-radius: 12px;
-        padding: 24px;
-        margin-bottom: 16px;
-        height: 100%;
-        transition: transform 0.2s ease-in-out, box-shadow 0.2s;
-    }
-    .feature-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.3);
-        border-color: #475569;
-    }
-    .feature-number {
-        color: #0ea5e9;
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin-bottom: 8px;
-    }
-    .feature-title {
-        font-size: 1.1rem;
-        font-weight: 600;
-        color: #f8fafc;
-        margin-bottom: 8px;
-    }
-    .feature-desc {
-        color: #94a3b8;
-        font-size: 0.95rem;
-        line-height: 1.5;
-    }
-    .tech-pill {
-        display: inline-block;
-        background-color: #334155;
-        color: #e2e8f0;
-        padding: 6px 16px;
-        border-radius: 9999px;
-        font-size: 0.85rem;
-        font-weight: 500;
-        margin: 4px;
-        border: 1px solid #475569;
-    }
-    
-    /* Restyle the st.info to be more elegant */
-    div[data-testid="stMarkdownContainer"] > div[role="alert"] {
-        background-color: rgba(14, 165, 233, 0.1);
-        color: #38bdf8;
-        border: 1px solid rgba(56, 189, 248, 0.2);
-        border-radius: 8px;
-    }
-</style>
-""", unsafe_allow_html=True)
+HERO_HTML = (
+    '<h1 class="main-title">E-Commerce Intelligence</h1>'
+    '<p class="subtitle">Turning 800K+ raw transactions into strategic business insights</p>'
+)
+
+
+@st.cache_resource
+def style_block(path: str) -> str:
+    """The <style> tag for styles.css, built once per server."""
+    with open(path, encoding='utf-8') as f:
+        return f"<style>{f.read()}</style>"
+
+
+# Hide sidebar navigation, adjust top padding & page styles (see styles.css)
+st.markdown(style_block(CSS_PATH), unsafe_allow_html=True)
 
 # Top Navbar
 col_spacer1, col_nav1, col_nav2, col_spacer2 = st.columns([3, 2, 2, 3])
 with col_nav1:
-    st.page_link("app.py", label="Dashboard", use_container_width=True)
+    st.page_link("app.py", label="Dashboard", width='stretch')
 with col_nav2:
-    st.page_link("pages/1_About.py", label="About the Project", use_container_width=True)
+    st.page_link("pages/1_About.py", label="About the Project", width='stretch')
 
 st.markdown("---")
 
 # Hero Section
 col_hero, col_empty = st.columns([8, 2])
 with col_hero:
-    st.markdown('<h1 class="main-title">E-Commerce Intelligence</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="subtitle">Turning 800K+ raw transactions into strategic business insights</p>', unsafe_allow_html=True)
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
     st.info("This end-to-end analytics project analyzes retail transactions across 41 countries, featuring interactive visualizations, RFM customer segmentation, and unsupervised learning algorithms.")
 
 st.markdown("<br>", unsafe_allow_html=True)
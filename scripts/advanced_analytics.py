@@ -13,9 +13,9 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from matplotlib.colors import ListedColormap
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from joblib import Parallel, delayed
 import os
 import warnings
 warnings.filterwarnings('ignore')
@@ -23,14 +23,17 @@ warnings.filterwarnings('ignore')
 # ─── CONFIGURATION ──────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(__file__)
 CLEANED_PATH = os.path.join(BASE_DIR, '..', 'data', 'cleaned', 'retail_cleaned.csv')
+CLEANED_PARQUET = CLEANED_PATH.replace('.csv', '.parquet')
 RFM_PATH = os.path.join(BASE_DIR, '..', 'data', 'cleaned', 'rfm_data.csv')
+RFM_PARQUET = RFM_PATH.replace('.csv', '.parquet')
 FIG_DIR = os.path.join(BASE_DIR, '..', 'outputs', 'figures')
 
 PALETTE = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#3B1F2B',
            '#44BBA4', '#E94F37', '#393E41', '#D4A373', '#6A994E']
 
+plt.ioff()
 plt.rcParams.update({
-    'figure.dpi': 150, 'font.size': 11, 'axes.titlesize': 14,
+    'figure.dpi': 100, 'font.size': 11, 'axes.titlesize': 14,
     'axes.titleweight': 'bold', 'axes.spines.top': False,
     'axes.spines.right': False, 'figure.facecolor': 'white',
     'axes.facecolor': '#FAFAFA', 'axes.grid': True, 'grid.alpha': 0.3
@@ -39,11 +42,20 @@ plt.rcParams.update({
 
 def savefig(name: str):
     path = os.path.join(FIG_DIR, f"{name}.png")
-    plt.savefig(path, bbox_inches='tight', facecolor='white')
+    # Figures are laid out with tight_layout at their final size, so no second bbox pass;
+    # light PNG compression keeps the write cheap
+    plt.savefig(path, facecolor='white', pil_kwargs={'optimize': False, 'compress_level': 3})
     plt.close()
     print(f"  📊 Saved → outputs/figures/{name}.png")
 
 
+def elbow_inertia(k: int, X: np.ndarray) -> float:
+    """Inertia of one elbow-sweep fit (module-level so joblib workers can run it)."""
+    km = MiniBatchKMeans(n_clusters=k, init='k-means++', batch_size=min(1024, len(X)),
+                         n_init=1, max_iter=100, random_state=42)
+    return km.fit(X).inertia_
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 12: K-Means Customer Clustering
 # ═══════════════════════════════════════════════════════════════════════════
@@ -55,23 +67,22 @@ def kmeans_clustering(rfm: pd.DataFrame) -> pd.DataFrame:
     """
     print("\n─── Analysis 12: K-Means Customer Clustering ───")
     
-    features = rfm[['Recency', 'Frequency', 'Monetary']].copy()
+    # Feature matrix built once as float32: Recency, log Frequency, log Monetary (logs handle skew)
+    scaled = np.empty((len(rfm), 3), dtype=np.float32)
+    scaled[:, 0] = rfm['Recency'].to_numpy()
+    scaled[:, 1] = np.log1p(rfm['Frequency'].to_numpy())
+    scaled[:, 2] = np.log1p(rfm['Monetary'].to_numpy())
     
-    # Log-transform monetary to handle skew
-    features['Monetary'] = np.log1p(features['Monetary'])
-    features['Frequency'] = np.log1p(features['Frequency'])
-    
-    # Standardize
-    scaler = StandardScaler()
-    scaled = scaler.fit_transform(features)
+    # Standardize in place (same as StandardScaler)
+    scaled -= scaled.mean(axis=0)
+    scaled /= scaled.std(axis=0)
     
     # ── Elbow Method ──
-    inertias = []
+    # Mini-batch fits are plenty for the shape of the curve; the final model below stays full KMeans.
+    # k-means++ seeding already gives a near-optimal start, so one init per k is enough here.
+    # The fits are independent, so they run across all cores.
     K_range = range(2, 11)
-    for k in K_range:
-        km = KMeans(n_clusters=k, random_state=42, n_init=10)
-        km.fit(scaled)
-        inertias.append(km.inertia_)
+    inertias = Parallel(n_jobs=-1)(delayed(elbow_inertia)(k, scaled) for k in K_range)
     
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.plot(K_range, inertias, 'bo-', linewidth=2, markersize=8)
@@ -84,11 +95,11 @@ def kmeans_clustering(rfm: pd.DataFrame) -> pd.DataFrame:
     savefig('13_elbow_method')
     
     # ── Fit final model with k=4 ──
-    km_final = KMeans(n_clusters=4, random_state=42, n_init=10)
+    km_final = KMeans(n_clusters=4, random_state=42, n_init=5)
     rfm['Cluster'] = km_final.fit_predict(scaled)
     
     # ── Cluster Profile ──
-    cluster_profile = rfm.groupby('Cluster').agg({
+    cluster_profile = rfm.groupby('Cluster', sort=False).agg({
         'Recency': 'mean',
         'Frequency': 'mean',
         'Monetary': ['mean', 'sum', 'count']
@@ -112,34 +123,33 @@ def kmeans_clustering(rfm: pd.DataFrame) -> pd.DataFrame:
     # ── Visualization: 2D Scatter ──
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
     
-    for cluster_id in sorted(rfm['Cluster'].unique()):
-        mask = rfm['Cluster'] == cluster_id
-        label = label_map[cluster_id]
-        ax1.scatter(rfm.loc[mask, 'Recency'], rfm.loc[mask, 'Monetary'],
-                    alpha=0.5, s=30, label=label, color=PALETTE[cluster_id])
+    # One scatter call per axis, coloured by cluster id through a fixed colormap
+    cluster_cmap = ListedColormap(PALETTE[:4])
+    cluster_ids = rfm['Cluster'].to_numpy()
+    legend_labels = [label_map[i] for i in sorted(label_map)]
+    
+    sc = ax1.scatter(rfm['Recency'], rfm['Monetary'], c=cluster_ids, cmap=cluster_cmap,
+                     vmin=0, vmax=3, alpha=0.5, s=30)
     ax1.set_xlabel('Recency (days)')
     ax1.set_ylabel('Monetary (£)')
     ax1.set_title('Recency vs Monetary by Cluster')
-    ax1.legend(fontsize=10)
+    ax1.legend(sc.legend_elements()[0], legend_labels, fontsize=10)
     ax1.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
     
-    for cluster_id in sorted(rfm['Cluster'].unique()):
-        mask = rfm['Cluster'] == cluster_id
-        label = label_map[cluster_id]
-        ax2.scatter(rfm.loc[mask, 'Frequency'], rfm.loc[mask, 'Monetary'],
-                    alpha=0.5, s=30, label=label, color=PALETTE[cluster_id])
+    sc = ax2.scatter(rfm['Frequency'], rfm['Monetary'], c=cluster_ids, cmap=cluster_cmap,
+                     vmin=0, vmax=3, alpha=0.5, s=30)
     ax2.set_xlabel('Frequency (orders)')
     ax2.set_ylabel('Monetary (£)')
     ax2.set_title('Frequency vs Monetary by Cluster')
-    ax2.legend(fontsize=10)
+    ax2.legend(sc.legend_elements()[0], legend_labels, fontsize=10)
     ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
     
-    plt.suptitle('K-Means Customer Clusters (k=4)', fontsize=16, fontweight='bold', y=1.02)
+    plt.suptitle('K-Means Customer Clusters (k=4)', fontsize=16, fontweight='bold')
     plt.tight_layout()
     savefig('14_kmeans_clusters')
     
     # ── Revenue share pie ──
-    cluster_rev = rfm.groupby('ClusterLabel')['Monetary'].sum().sort_values(ascending=False)
+    cluster_rev = rfm.groupby('ClusterLabel', observed=True, sort=False)['Monetary'].sum().sort_values(ascending=False)
     fig, ax = plt.subplots(figsize=(9, 9))
     wedges, texts, autotexts = ax.pie(cluster_rev, labels=cluster_rev.index, autopct='%1.1f%%',
                                        colors=PALETTE[:4], startangle=90, pctdistance=0.8,
@@ -169,7 +179,7 @@ def clv_estimation(df: pd.DataFrame, rfm: pd.DataFrame):
     print("\n─── Analysis 13: Customer Lifetime Value (CLV) Estimation ───")
     
     # Calculate per-customer metrics
-    customer_metrics = df.groupby('Customer ID').agg(
+    customer_metrics = df.groupby('Customer ID', sort=False).agg(
         total_revenue=('Revenue', 'sum'),
         order_count=('Invoice', 'nunique'),
         first_purchase=('InvoiceDate', 'min'),
@@ -200,11 +210,12 @@ def clv_estimation(df: pd.DataFrame, rfm: pd.DataFrame):
     
     # CLV by cluster
     if 'ClusterLabel' in rfm.columns:
-        merged = customer_metrics.merge(rfm[['CustomerID', 'ClusterLabel']], 
-                                         left_on='Customer ID', right_on='CustomerID', how='left')
-        merged = merged[merged['lifespan_days'] > 0]
+        # Plain lookup by customer instead of a merge
+        cluster_by_customer = pd.Series(rfm['ClusterLabel'].values, index=rfm['CustomerID'])
+        customer_metrics['ClusterLabel'] = customer_metrics['Customer ID'].map(cluster_by_customer)
+        merged = customer_metrics[customer_metrics['lifespan_days'] > 0]
         
-        cluster_clv = merged.groupby('ClusterLabel').agg(
+        cluster_clv = merged.groupby('ClusterLabel', observed=True, sort=False).agg(
             avg_aov=('aov', 'mean'),
             avg_orders=('order_count', 'mean'),
             avg_lifespan_m=('lifespan_months', 'mean'),
@@ -222,6 +233,7 @@ def clv_estimation(df: pd.DataFrame, rfm: pd.DataFrame):
                     bar.get_y() + bar.get_height()/2,
                     f'£{val:,.0f}', ha='left', va='center', fontsize=11, fontweight='bold')
         
+        ax.margins(x=0.12)  # room for the value labels inside the axes
         ax.set_title('Estimated CLV by Customer Cluster', fontsize=16, pad=15)
         ax.set_xlabel('Customer Lifetime Value (£)')
         ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
@@ -246,8 +258,12 @@ def main():
     print("PHASE 4: ADVANCED ANALYTICS")
     print("=" * 60)
     
-    df = pd.read_csv(CLEANED_PATH, parse_dates=['InvoiceDate'])
-    rfm = pd.read_csv(RFM_PATH)
+    # Prefer the Parquet copy written by data_cleaning.py, fall back to CSV
+    if os.path.exists(CLEANED_PARQUET):
+        df = pd.read_parquet(CLEANED_PARQUET, engine='pyarrow')
+    else:
+        df = pd.read_csv(CLEANED_PATH, parse_dates=['InvoiceDate'])
+    rfm = pd.read_parquet(RFM_PARQUET, engine='pyarrow') if os.path.exists(RFM_PARQUET) else pd.read_csv(RFM_PATH)
     
     print(f"Loaded {len(df):,} transactions | {len(rfm):,} customer RFM records")
     
@@ -255,8 +271,10 @@ def main():
     clv = clv_estimation(df, rfm)
     
     # Save enriched RFM with clusters
+    # CSV for reading by eye; the Parquet copy is what the dashboard and scripts load
     rfm.to_csv(RFM_PATH, index=False)
-    print(f"\n✅ Enriched RFM saved with cluster labels → data/cleaned/rfm_data.csv")
+    rfm.to_parquet(RFM_PARQUET, engine='pyarrow', compression='snappy', index=False)
+    print(f"\n✅ Enriched RFM saved with cluster labels → data/cleaned/rfm_data.csv (+ .parquet)")
     print("✅ Phase 4 complete!")
 
 
@@ -1,71 +1,149 @@
+"""
+E-Commerce Sales Intelligence Dashboard
+KPI Extraction Utility
+======================
+Headline numbers quoted in the README and executive summary. load_kpis()
+returns them as a dict (cached per file version) for reuse from other
+code; running the script prints them.
+"""
+
 import pandas as pd
 import numpy as np
+import os
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(__file__)
+CLEANED_PATH = os.path.join(BASE_DIR, '..', 'data', 'cleaned', 'retail_cleaned.csv')
+RFM_PATH = os.path.join(BASE_DIR, '..', 'data', 'cleaned', 'rfm_data.csv')
+
+
+def nunique_by(keys, values):
+    """Distinct values per key: factorize, drop repeated (key, value) pairs, count per key.
+
+    Sort-based NumPy replacement for groupby(...).nunique(), which hashes per group.
+    """
+    key_codes, key_labels = pd.factorize(keys, sort=True)
+    value_codes, value_labels = pd.factorize(values)
+    n_values = len(value_labels)
+    pairs = np.unique(key_codes.astype(np.int64) * n_values + value_codes)
+    return pd.Series(np.bincount(pairs // n_values, minlength=len(key_labels)), index=key_labels)
+
+
+def load_kpis(cleaned_path: str = CLEANED_PATH, rfm_path: str = RFM_PATH) -> dict:
+    """Compute every headline KPI; repeat calls reuse the result until a data file changes."""
+    # Prefer the Parquet copy written by data_cleaning.py, fall back to CSV
+    parquet_path = cleaned_path.replace('.csv', '.parquet')
+    txn_path = parquet_path if os.path.exists(parquet_path) else cleaned_path
+    rfm_parquet = rfm_path.replace('.csv', '.parquet')
+    rfm_path = rfm_parquet if os.path.exists(rfm_parquet) else rfm_path
+    return _compute_kpis(txn_path, rfm_path, os.path.getmtime(txn_path), os.path.getmtime(rfm_path))
+
+
+@lru_cache(maxsize=4)
+def _compute_kpis(txn_path: str, rfm_path: str, txn_mtime: float, rfm_mtime: float) -> dict:
+    # The mtimes are only part of the cache key, so rewritten files are re-read
+    if txn_path.endswith('.parquet'):
+        df = pd.read_parquet(txn_path, engine='pyarrow')
+    else:
+        df = pd.read_csv(txn_path, parse_dates=['InvoiceDate'])
+    rfm = pd.read_parquet(rfm_path, engine='pyarrow') if rfm_path.endswith('.parquet') else pd.read_csv(rfm_path)
+
+    # Hash Customer ID once; the int codes serve every per-customer step below
+    cust_codes, cust_ids = pd.factorize(df['Customer ID'])
+
+    total_rev = df['Revenue'].sum()
+    total_orders = df['Invoice'].nunique()
+    total_custs = len(cust_ids)
+    aov = total_rev / total_orders
+    countries = df['Country'].nunique()
+
+    monthly = df.groupby('YearMonth', observed=True, sort=False)['Revenue'].sum().sort_index()
+    growth_rates = monthly.pct_change().dropna() * 100
+    avg_growth = growth_rates.mean()
+
+    pc = nunique_by(cust_codes, df['Invoice'])
+    repeat = (pc > 1).sum() / len(pc) * 100
+
+    df_yoy = df[df['Year'].isin([2010, 2011])]
+    m_yoy = df_yoy.groupby('Year', sort=False)['Revenue'].sum()
+    yoy_growth = (m_yoy.get(2011, 0) - m_yoy.get(2010, 0)) / m_yoy.get(2010, 1) * 100
+
+    # Customer count and revenue for every segment in one pass, then read off the two we report
+    seg = rfm.groupby('Segment', observed=True, sort=False).agg(n=('CustomerID', 'size'), rev=('Monetary', 'sum'))
+    seg = seg.reindex(['Champions', 'At Risk'], fill_value=0)
+    total_n = len(rfm)
+    total_rev_rfm = rfm['Monetary'].sum()
+    champ_pct = seg.loc['Champions', 'n'] / total_n * 100
+    champ_rev_pct = seg.loc['Champions', 'rev'] / total_rev_rfm * 100
+    at_risk_pct = seg.loc['At Risk', 'n'] / total_n * 100
+    at_risk_rev = seg.loc['At Risk', 'rev']
+
+    tp = df.groupby('Description', observed=True, sort=False)['Revenue'].sum().nlargest(5)
+
+    uk_rev = df[df['Country'] == 'United Kingdom']['Revenue'].sum()
+    uk_pct = uk_rev / total_rev * 100
+
+    # Cohort retention — months as integer counts (year*12 + month), no frame copy;
+    # each customer's first month is gathered back by customer code rather than a transform
+    invoice_month = (df['InvoiceDate'].dt.year * 12 + df['InvoiceDate'].dt.month - 1).to_numpy()
+    first_month = pd.Series(invoice_month).groupby(cust_codes).min().to_numpy()
+    cohort_month = first_month[cust_codes]
+    # One integer key per (cohort, months-since-first) cell; customers per cell via nunique_by
+    n_months = int(invoice_month.max() - invoice_month.min()) + 1
+    cell_counts = nunique_by(cohort_month * n_months + (invoice_month - cohort_month), cust_codes)
+    cohort_data = pd.DataFrame({'CohortMonth': cell_counts.index // n_months,
+                                'CohortIndex': cell_counts.index % n_months,
+                                'Customer ID': cell_counts.values})
+    cohort_pivot = cohort_data.pivot(index='CohortMonth', columns='CohortIndex', values='Customer ID')
+    cohort_sizes = cohort_pivot.iloc[:, 0]
+    retention = cohort_pivot.divide(cohort_sizes, axis=0) * 100
+    avg_m1 = retention.iloc[:, 1].mean() if retention.shape[1] > 1 else 0
+
+    return {
+        'total_revenue': total_rev,
+        'total_orders': total_orders,
+        'total_customers': total_custs,
+        'aov': aov,
+        'countries': countries,
+        'avg_monthly_growth': avg_growth,
+        'repeat_rate': repeat,
+        'yoy_growth': yoy_growth,
+        'champ_pct': champ_pct,
+        'champ_rev_pct': champ_rev_pct,
+        'at_risk_pct': at_risk_pct,
+        'at_risk_rev': at_risk_rev,
+        'uk_pct': uk_pct,
+        'avg_m1_retention': avg_m1,
+        'peak_month': monthly.idxmax(),
+        'peak_rev': monthly.max(),
+        'top_products': tp,
+    }
+
+
+def main():
+    kpis = load_kpis()
+
+    print(f"TOTAL_REVENUE: {kpis['total_revenue']:.2f}")
+    print(f"TOTAL_ORDERS: {kpis['total_orders']}")
+    print(f"TOTAL_CUSTOMERS: {kpis['total_customers']}")
+    print(f"AOV: {kpis['aov']:.2f}")
+    print(f"COUNTRIES: {kpis['countries']}")
+    print(f"AVG_MONTHLY_GROWTH: {kpis['avg_monthly_growth']:.1f}")
+    print(f"REPEAT_RATE: {kpis['repeat_rate']:.1f}")
+    print(f"YOY_GROWTH: {kpis['yoy_growth']:.1f}")
+    print(f"CHAMP_PCT: {kpis['champ_pct']:.1f}")
+    print(f"CHAMP_REV_PCT: {kpis['champ_rev_pct']:.1f}")
+    print(f"AT_RISK_PCT: {kpis['at_risk_pct']:.1f}")
+    print(f"AT_RISK_REV: {kpis['at_risk_rev']:.0f}")
+    print(f"UK_PCT: {kpis['uk_pct']:.1f}")
+    print(f"AVG_M1_RETENTION: {kpis['avg_m1_retention']:.1f}")
+    print(f"PEAK_MONTH: {kpis['peak_month']}")
+    print(f"PEAK_REV: {kpis['peak_rev']:.0f}")
+    print()
+    print('TOP 5 PRODUCTS:')
+    for desc, rev in kpis['top_products'].items():
+        print(f'  {desc}: {rev:.0f}')
+
 
-df = pd.read_csv(r'd:\Projects\E-commrce analytics dashboard\data\cleaned\retail_cleaned.csv', parse_dates=['InvoiceDate'])
-rfm = pd.read_csv(r'd:\Projects\E-commrce analytics dashboard\data\cleaned\rfm_data.csv')
-
-total_rev = df['Revenue'].sum()
-total_orders = df['Invoice'].nunique()
-total_custs = df['Customer ID'].nunique()
-aov = total_rev / total_orders
-countries = df['Country'].nunique()
-
-monthly = df.groupby('YearMonth')['Revenue'].sum().sort_index()
-growth_rates = monthly.pct_change().dropna() * 100
-avg_growth = growth_rates.mean()
-
-pc = df.groupby('Customer ID')['Invoice'].nunique()
-repeat = (pc > 1).sum() / len(pc) * 100
-
-df_yoy = df[df['Year'].isin([2010, 2011])]
-m_yoy = df_yoy.groupby('Year')['Revenue'].sum()
-yoy_growth = (m_yoy.get(2011, 0) - m_yoy.get(2010, 0)) / m_yoy.get(2010, 1) * 100
-
-champs = rfm[rfm['Segment'] == 'Champions']
-champ_pct = len(champs) / len(rfm) * 100
-champ_rev_pct = champs['Monetary'].sum() / rfm['Monetary'].sum() * 100
-
-at_risk = rfm[rfm['Segment'] == 'At Risk']
-at_risk_pct = len(at_risk) / len(rfm) * 100
-at_risk_rev = at_risk['Monetary'].sum()
-
-tp = df.groupby('Description')['Revenue'].sum().sort_values(ascending=False).head(5)
-
-uk_rev = df[df['Country'] == 'United Kingdom']['Revenue'].sum()
-uk_pct = uk_rev / total_rev * 100
-
-# Cohort retention
-df_c = df.copy()
-df_c['InvoiceMonth'] = df_c['InvoiceDate'].dt.to_period('M')
-df_c['CohortMonth'] = df_c.groupby('Customer ID')['InvoiceMonth'].transform('min')
-df_c['CohortIndex'] = (df_c['InvoiceMonth'].dt.year - df_c['CohortMonth'].dt.year)*12 + (df_c['InvoiceMonth'].dt.month - df_c['CohortMonth'].dt.month)
-cohort_data = df_c.groupby(['CohortMonth', 'CohortIndex'])['Customer ID'].nunique().reset_index()
-cohort_pivot = cohort_data.pivot(index='CohortMonth', columns='CohortIndex', values='Customer ID')
-cohort_sizes = cohort_pivot.iloc[:, 0]
-retention = cohort_pivot.divide(cohort_sizes, axis=0) * 100
-avg_m1 = retention.iloc[:, 1].mean() if retention.shape[1] > 1 else 0
-
-# Peak month
-peak_month = monthly.idxmax()
-peak_rev = monthly.max()
-
-print(f'TOTAL_REVENUE: {total_rev:.2f}')
-print(f'TOTAL_ORDERS: {total_orders}')
-print(f'TOTAL_CUSTOMERS: {total_custs}')
-print(f'AOV: {aov:.2f}')
-print(f'COUNTRIES: {countries}')
-print(f'AVG_MONTHLY_GROWTH: {avg_growth:.1f}')
-print(f'REPEAT_RATE: {repeat:.1f}')
-print(f'YOY_GROWTH: {yoy_growth:.1f}')
-print(f'CHAMP_PCT: {champ_pct:.1f}')
-print(f'CHAMP_REV_PCT: {champ_rev_pct:.1f}')
-print(f'AT_RISK_PCT: {at_risk_pct:.1f}')
-print(f'AT_RISK_REV: {at_risk_rev:.0f}')
-print(f'UK_PCT: {uk_pct:.1f}')
-print(f'AVG_M1_RETENTION: {avg_m1:.1f}')
-print(f'PEAK_MONTH: {peak_month}')
-print(f'PEAK_REV: {peak_rev:.0f}')
-print()
-print('TOP 5 PRODUCTS:')
-for desc, rev in tp.items():
-    print(f'  {desc}: {rev:.0f}')
+if __name__ == '__main__':
+    main()
@@ -16,9 +16,11 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
-import seaborn as sns
+import contextlib
+import io
 import os
 import warnings
+from joblib import Memory, Parallel, delayed
 warnings.filterwarnings('ignore')
 
 # ─── STYLE CONFIGURATION ────────────────────────────────────────────────────
@@ -44,56 +46,138 @@ PALETTE = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#3B1F2B',
 BASE_DIR = os.path.dirname(__file__)
 DATA_PATH = os.path.join(BASE_DIR, '..', 'data', 'cleaned', 'retail_cleaned.csv')
 FIG_DIR = os.path.join(BASE_DIR, '..', 'outputs', 'figures')
+CACHE_DIR = os.path.join(BASE_DIR, '..', 'data', 'cache')
 os.makedirs(FIG_DIR, exist_ok=True)
+memory = Memory(CACHE_DIR, verbose=0)
+
+
+CATEGORY_COLUMNS = ['Country', 'StockCode', 'Description', 'DayOfWeek', 'YearMonth', 'Quarter']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Narrow integer types; Revenue stays float64 because float32 shifts the £ totals by pennies
+NUMERIC_DTYPES = {'Customer ID': 'int32', 'Quantity': 'int32', 'Year': 'int16', 'Hour': 'int8'}
+# Columns the analyses read; Price and Month are never touched, so they are not loaded
+ANALYSIS_COLUMNS = ['Invoice', 'StockCode', 'Description', 'Quantity', 'InvoiceDate', 'Customer ID',
+                    'Country', 'Revenue', 'Year', 'YearMonth', 'Quarter', 'DayOfWeek', 'Hour']
 
 
 def load_data() -> pd.DataFrame:
-    """Load the cleaned dataset."""
+    """Load the cleaned dataset, via a typed Parquet copy when it is current."""
     print("=" * 60)
     print("PHASE 3: KPI ANALYSIS & VISUALIZATIONS")
     print("=" * 60)
-    df = pd.read_csv(DATA_PATH, parse_dates=['InvoiceDate'])
-    print(f"\nLoaded {len(df):,} rows | {df['Customer ID'].nunique():,} customers | {df['Invoice'].nunique():,} orders")
+    cache = DATA_PATH.replace('.csv', '.parquet')
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(DATA_PATH):
+        df = pd.read_parquet(cache, engine='pyarrow', columns=ANALYSIS_COLUMNS).astype(NUMERIC_DTYPES)
+    else:
+        # Parse the CSV once with explicit types, then keep the binary copy for later runs
+        df = pd.read_csv(DATA_PATH, parse_dates=['InvoiceDate'],
+                         dtype={'Invoice': 'string', 'StockCode': 'string', 'Month': 'int8', **NUMERIC_DTYPES})
+        # Low-cardinality text → category, so every groupby below works on int codes
+        df[CATEGORY_COLUMNS] = df[CATEGORY_COLUMNS].astype('category')
+        df['DayOfWeek'] = df['DayOfWeek'].cat.set_categories(DAY_ORDER)
+        # The cache is shared with the dashboard, so it keeps every column with the
+        # same compact dtypes data_cleaning.save_cleaned_data writes
+        df.to_parquet(cache, engine='pyarrow', compression='snappy', index=False)
+        df = df[ANALYSIS_COLUMNS]
+    # One sort up front: each customer's rows become a contiguous run in date order,
+    # so per-customer reductions can work on slices (see reduceat_by)
+    df = df.sort_values(['Customer ID', 'InvoiceDate'], kind='stable', ignore_index=True)
+    # Hash Invoice once; the int codes stand in for it in every order count below
+    invoice_codes, invoices = pd.factorize(df['Invoice'])
+    df['InvoiceCode'] = invoice_codes.astype(np.int32)
+    df.attrs['n_invoices'] = len(invoices)
+    print(f"\nLoaded {len(df):,} rows | {df['Customer ID'].nunique():,} customers | {df.attrs['n_invoices']:,} orders")
     return df
 
 
-def savefig(name: str):
-    """Save current figure to outputs/figures/."""
+def savefig(name: str, dpi=None):
+    """Save current figure to outputs/figures/ (at figure.dpi unless dpi is given)."""
     path = os.path.join(FIG_DIR, f"{name}.png")
-    plt.savefig(path, bbox_inches='tight', facecolor='white')
+    plt.savefig(path, bbox_inches='tight', facecolor='white', dpi=dpi)
     plt.close()
     print(f"  📊 Saved → outputs/figures/{name}.png")
 
 
+def first_rank(x: np.ndarray) -> np.ndarray:
+    """1-based ranks with ties broken by position, like Series.rank(method='first')."""
+    ranks = np.empty(len(x), dtype=np.int64)
+    ranks[np.argsort(x, kind='stable')] = np.arange(1, len(x) + 1)
+    return ranks
+
+
+def quintile_scores(x: np.ndarray, ascending: bool = True) -> np.ndarray:
+    """Score values 1–5 by quintile with the same right-closed edges as pd.qcut(x, 5).
+
+    The top quintile scores 5 when ascending, 1 otherwise.
+    """
+    edges = np.quantile(x, [0.2, 0.4, 0.6, 0.8])
+    bins = np.searchsorted(edges, x, side='left')
+    return (bins + 1 if ascending else 5 - bins).astype(np.int8)
+
+
+def reduceat_by(keys: np.ndarray, values: np.ndarray, ufunc=np.add) -> tuple:
+    """Reduce values over runs of equal keys with ufunc.reduceat; keys must already be sorted.
+
+    Returns (key of each run, reduced value of each run).
+    """
+    starts = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1]
+    return keys[starts], ufunc.reduceat(values, starts)
+
+
+def growth_stats(revenue: np.ndarray) -> tuple:
+    """Month-over-month growth of a time-sorted revenue array.
+
+    Returns (rates in %, mean rate, number of months that shrank).
+    """
+    rates = (revenue[1:] / revenue[:-1] - 1) * 100
+    return rates, rates.mean(), int((rates < 0).sum())
+
+
+def precompute_aggregates(df: pd.DataFrame) -> dict:
+    """Revenue aggregates shared by several analyses, and their peaks, computed in one place and passed in."""
+    monthly = df.groupby('YearMonth', observed=True, sort=False)['Revenue'].sum().sort_index()
+    quarterly = df.groupby('Quarter', observed=True, sort=False)['Revenue'].sum().sort_index()
+    hourly = df.groupby('Hour', sort=False)['Revenue'].sum().sort_index()
+    daily = df.groupby('DayOfWeek', observed=True, sort=False)['Revenue'].sum().reindex(DAY_ORDER)
+    return {
+        'monthly': monthly,
+        'quarterly': quarterly,
+        'hourly': hourly,
+        'daily': daily,
+        'order_rev': df.groupby(['YearMonth', 'InvoiceCode'], observed=True, sort=False)['Revenue'].sum(),
+        'yoy': df.groupby(['Year', df['InvoiceDate'].dt.month.rename('MonthNum')], sort=False)['Revenue'].sum().sort_index(),
+        'monthly_peak_pos': int(monthly.to_numpy().argmax()),
+        'quarterly_top': quarterly.idxmax(),
+        'hourly_top3': hourly.nlargest(3).index.tolist(),
+        'daily_top': daily.idxmax(),
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 1: Monthly Revenue Trend
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_monthly_revenue(df: pd.DataFrame):
+def analysis_monthly_revenue(monthly: pd.Series, peak_pos: int):
     """
     BUSINESS QUESTION: Is revenue growing or declining month-over-month?
     STRATEGIC VALUE: Identifies momentum, seasonality, and inflection points.
     """
     print("\n─── Analysis 1: Monthly Revenue Trend ───")
     
-    monthly = df.groupby('YearMonth')['Revenue'].sum().reset_index()
-    monthly = monthly.sort_values('YearMonth')
-    
     fig, ax = plt.subplots(figsize=(14, 6))
-    ax.fill_between(range(len(monthly)), monthly['Revenue'], alpha=0.15, color=PALETTE[0])
-    ax.plot(range(len(monthly)), monthly['Revenue'], color=PALETTE[0], linewidth=2.5, marker='o', markersize=5)
+    ax.fill_between(range(len(monthly)), monthly.values, alpha=0.15, color=PALETTE[0])
+    ax.plot(range(len(monthly)), monthly.values, color=PALETTE[0], linewidth=2.5, marker='o', markersize=5)
     
     # Annotate peak
-    peak_idx = monthly['Revenue'].idxmax()
-    peak_val = monthly.loc[peak_idx, 'Revenue']
-    peak_month = monthly.loc[peak_idx, 'YearMonth']
+    peak_val = monthly.iloc[peak_pos]
+    peak_month = monthly.index[peak_pos]
     ax.annotate(f'Peak: £{peak_val:,.0f}\n({peak_month})', 
-                xy=(monthly.index.get_loc(peak_idx), peak_val),
+                xy=(peak_pos, peak_val),
                 xytext=(0, 20), textcoords='offset points',
                 fontsize=10, fontweight='bold', color=PALETTE[3],
                 arrowprops=dict(arrowstyle='->', color=PALETTE[3]))
     
     ax.set_xticks(range(len(monthly)))
-    ax.set_xticklabels(monthly['YearMonth'], rotation=45, ha='right', fontsize=9)
+    ax.set_xticklabels(monthly.index.astype(str), rotation=45, ha='right', fontsize=9)
     ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
     ax.set_title('Monthly Revenue Trend', fontsize=16, pad=15)
     ax.set_xlabel('Month')
@@ -108,22 +192,18 @@ def analysis_monthly_revenue(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 2: Quarterly Revenue
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_quarterly_revenue(df: pd.DataFrame):
+def analysis_quarterly_revenue(quarterly: pd.Series, top_q: str):
     """
     BUSINESS QUESTION: Which quarters drive the most revenue?
     STRATEGIC VALUE: Aligns inventory planning and promotional calendars.
     """
     print("\n─── Analysis 2: Quarterly Revenue ───")
     
-    quarterly = df.groupby('Quarter')['Revenue'].sum().reset_index().sort_values('Quarter')
-    
     fig, ax = plt.subplots(figsize=(12, 6))
-    colors = [PALETTE[0] if v < quarterly['Revenue'].max() else PALETTE[3] for v in quarterly['Revenue']]
-    bars = ax.bar(quarterly['Quarter'], quarterly['Revenue'], color=colors, width=0.6, edgecolor='white')
+    colors = np.where(quarterly.to_numpy() == quarterly.max(), PALETTE[3], PALETTE[0])
+    bars = ax.bar(quarterly.index.astype(str), quarterly.values, color=colors, width=0.6, edgecolor='white')
     
-    for bar, val in zip(bars, quarterly['Revenue']):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + quarterly['Revenue'].max()*0.01,
-                f'£{val:,.0f}', ha='center', va='bottom', fontsize=9, fontweight='bold')
+    ax.bar_label(bars, fmt='£{:,.0f}', padding=3, fontsize=9, fontweight='bold')
     
     ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
     ax.set_title('Revenue by Quarter', fontsize=16, pad=15)
@@ -133,7 +213,6 @@ def analysis_quarterly_revenue(df: pd.DataFrame):
     plt.tight_layout()
     savefig('02_quarterly_revenue')
     
-    top_q = quarterly.loc[quarterly['Revenue'].idxmax(), 'Quarter']
     print(f"  💡 Interpretation: {top_q} is the highest-grossing quarter.")
     print(f"  📌 Recommendation: Front-load inventory and staffing for Q4 holiday demand.")
 
@@ -141,16 +220,14 @@ def analysis_quarterly_revenue(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 3: Year-over-Year Comparison
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_yoy_comparison(df: pd.DataFrame):
+def analysis_yoy_comparison(yoy: pd.Series):
     """
     BUSINESS QUESTION: How does 2011 compare to 2010?
     STRATEGIC VALUE: Measures overall business trajectory.
     """
     print("\n─── Analysis 3: Year-over-Year Revenue Comparison ───")
     
-    df_yoy = df[df['Year'].isin([2010, 2011])].copy()
-    df_yoy['MonthNum'] = df_yoy['InvoiceDate'].dt.month
-    monthly_yoy = df_yoy.groupby(['Year', 'MonthNum'])['Revenue'].sum().reset_index()
+    monthly_yoy = yoy.reset_index()
     
     fig, ax = plt.subplots(figsize=(12, 6))
     for i, year in enumerate([2010, 2011]):
@@ -178,28 +255,26 @@ def analysis_yoy_comparison(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 4: Monthly Growth Rate
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_monthly_growth_rate(df: pd.DataFrame):
+def analysis_monthly_growth_rate(monthly_revenue: pd.Series):
     """
     BUSINESS QUESTION: What is the revenue growth momentum month-over-month?
     STRATEGIC VALUE: Detects acceleration, deceleration, or contraction early.
     """
     print("\n─── Analysis 4: Monthly Revenue Growth Rate ───")
     
-    monthly = df.groupby('YearMonth')['Revenue'].sum().reset_index().sort_values('YearMonth')
-    monthly['GrowthRate'] = monthly['Revenue'].pct_change() * 100
-    monthly = monthly.dropna()
+    rates, avg_growth, neg_months = growth_stats(monthly_revenue.to_numpy())
+    months = monthly_revenue.index[1:].astype(str)
     
     fig, ax = plt.subplots(figsize=(14, 6))
-    colors = [PALETTE[0] if v >= 0 else PALETTE[3] for v in monthly['GrowthRate']]
-    ax.bar(range(len(monthly)), monthly['GrowthRate'], color=colors, width=0.7, edgecolor='white')
+    colors = [PALETTE[0] if v >= 0 else PALETTE[3] for v in rates]
+    ax.bar(range(len(rates)), rates, color=colors, width=0.7, edgecolor='white')
     ax.axhline(y=0, color='black', linewidth=0.8)
     
-    avg_growth = monthly['GrowthRate'].mean()
     ax.axhline(y=avg_growth, color=PALETTE[1], linewidth=1.5, linestyle='--',
                label=f'Avg Growth: {avg_growth:.1f}%')
     
-    ax.set_xticks(range(len(monthly)))
-    ax.set_xticklabels(monthly['YearMonth'], rotation=45, ha='right', fontsize=9)
+    ax.set_xticks(range(len(rates)))
+    ax.set_xticklabels(months, rotation=45, ha='right', fontsize=9)
     ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'{x:+.0f}%'))
     ax.set_title('Month-over-Month Revenue Growth Rate', fontsize=16, pad=15)
     ax.set_xlabel('Month')
@@ -208,7 +283,6 @@ def analysis_monthly_growth_rate(df: pd.DataFrame):
     plt.tight_layout()
     savefig('04_monthly_growth_rate')
     
-    neg_months = (monthly['GrowthRate'] < 0).sum()
     print(f"  💡 Interpretation: Avg monthly growth = {avg_growth:.1f}%. {neg_months} months showed contraction.")
     print(f"  📌 Recommendation: Investigate the contraction months for causes (seasonality vs. operational issues).")
 
@@ -224,19 +298,23 @@ def analysis_cohort_retention(df: pd.DataFrame):
     """
     print("\n─── Analysis 5: Cohort Retention Analysis ───")
     
-    df_cohort = df.copy()
-    df_cohort['InvoiceMonth'] = df_cohort['InvoiceDate'].dt.to_period('M')
-    
-    # First purchase month per customer
-    df_cohort['CohortMonth'] = df_cohort.groupby('Customer ID')['InvoiceMonth'].transform('min')
+    # Months as plain integers (year*12 + month-1) so the cohort maths stays in NumPy
+    cust = df['Customer ID'].to_numpy()
+    mn = (df['InvoiceDate'].dt.year.to_numpy(np.int32) * 12 +
+          df['InvoiceDate'].dt.month.to_numpy(np.int32) - 1)
     
-    # Cohort index (months since first purchase)
-    df_cohort['CohortIndex'] = (df_cohort['InvoiceMonth'].dt.year - df_cohort['CohortMonth'].dt.year) * 12 + \
-                                (df_cohort['InvoiceMonth'].dt.month - df_cohort['CohortMonth'].dt.month)
+    # First purchase month per customer (df is sorted by customer), spread back to every row
+    customers, first_month = reduceat_by(cust, mn, np.minimum)
+    cohort_month = first_month[np.searchsorted(customers, cust)]
     
-    # Cohort table
-    cohort_data = df_cohort.groupby(['CohortMonth', 'CohortIndex'])['Customer ID'].nunique().reset_index()
+    # Cohort table: only the three int columns it needs, not a copy of df;
+    # cohort index = months since first purchase
+    cohort_data = (pd.DataFrame({'CohortMonth': cohort_month, 'CohortIndex': mn - cohort_month, 'Customer ID': cust})
+                   .groupby(['CohortMonth', 'CohortIndex'], sort=False)['Customer ID'].nunique().reset_index())
     cohort_pivot = cohort_data.pivot(index='CohortMonth', columns='CohortIndex', values='Customer ID')
+    # Back to YYYY-MM labels for the heatmap rows
+    yyyymm = (cohort_pivot.index // 12) * 100 + cohort_pivot.index % 12 + 1
+    cohort_pivot.index = pd.to_datetime(yyyymm.astype(str), format='%Y%m').strftime('%Y-%m').rename('CohortMonth')
     
     # Retention percentages
     cohort_sizes = cohort_pivot.iloc[:, 0]
@@ -246,9 +324,22 @@ def analysis_cohort_retention(df: pd.DataFrame):
     retention = retention.iloc[:12, :13]
     
     fig, ax = plt.subplots(figsize=(14, 8))
-    sns.heatmap(retention, annot=True, fmt='.0f', cmap='YlOrRd_r', linewidths=0.5,
-                ax=ax, cbar_kws={'label': 'Retention %', 'shrink': 0.8},
-                vmin=0, vmax=100)
+    values = retention.to_numpy()
+    n_rows, n_cols = values.shape
+    im = ax.imshow(values, cmap='YlOrRd_r', aspect='auto', vmin=0, vmax=100)
+    fig.colorbar(im, ax=ax, label='Retention %', shrink=0.8).outline.set_visible(False)
+    ax.set_xticks(range(n_cols), retention.columns)
+    ax.set_yticks(range(n_rows), retention.index)
+    # White borders between cells, drawn as a grid on the minor ticks
+    ax.set_xticks(np.arange(n_cols + 1) - 0.5, minor=True)
+    ax.set_yticks(np.arange(n_rows + 1) - 0.5, minor=True)
+    ax.grid(False)
+    ax.grid(True, which='minor', color='white', linewidth=1, alpha=1)
+    ax.tick_params(which='minor', length=0)
+    ax.spines[:].set_visible(False)
+    for i, j in zip(*np.nonzero(~np.isnan(values))):
+        v = values[i, j]
+        ax.text(j, i, f'{v:.0f}', ha='center', va='center', color='#262626' if v > 60 else 'white')
     ax.set_title('Customer Cohort Retention Heatmap (%)', fontsize=16, pad=15)
     ax.set_xlabel('Months Since First Purchase', fontsize=12)
     ax.set_ylabel('Cohort (First Purchase Month)', fontsize=12)
@@ -268,7 +359,51 @@ def analysis_cohort_retention(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 6: RFM Analysis
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_rfm(df: pd.DataFrame) -> pd.DataFrame:
+def build_rfm(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-customer Recency / Frequency / Monetary table with 1–5 scores and a segment."""
+    snapshot_date = df['InvoiceDate'].max() + pd.Timedelta(days=1)
+    
+    # df is sorted by Customer ID, so every customer is one run and the reductions come
+    # out in ID order (first_rank() below breaks ties by position). Each invoice belongs
+    # to one customer, so Frequency is a count of first invoice rows per customer
+    cust = df['Customer ID'].to_numpy()
+    customers, last_purchase = reduceat_by(cust, df['InvoiceDate'].to_numpy(), np.maximum)
+    _, frequency = reduceat_by(cust, (~df['InvoiceCode'].duplicated()).to_numpy(dtype=np.int64))
+    _, monetary = reduceat_by(cust, df['Revenue'].to_numpy())
+    rfm = pd.DataFrame({
+        'CustomerID': customers,
+        'Recency': (snapshot_date.to_datetime64() - last_purchase) // np.timedelta64(1, 'D'),
+        'Frequency': frequency,
+        'Monetary': monetary,
+    })
+    
+    # Score each dimension 1–5 (quintiles)
+    rfm['R_Score'] = quintile_scores(rfm['Recency'].to_numpy(), ascending=False)
+    rfm['F_Score'] = quintile_scores(first_rank(rfm['Frequency'].to_numpy()))
+    rfm['M_Score'] = quintile_scores(first_rank(rfm['Monetary'].to_numpy()))
+    # Scores are 1–5, so 100R + 10F + M reads the same as the concatenated digits
+    rfm['RFM_Score'] = (rfm['R_Score'].to_numpy(np.int16) * 100 + rfm['F_Score'].to_numpy(np.int16) * 10 +
+                        rfm['M_Score'].to_numpy(np.int16))
+    
+    # Segment mapping — rules are checked in order, first match wins
+    R = rfm['R_Score'].to_numpy()
+    F = rfm['F_Score'].to_numpy()
+    M = rfm['M_Score'].to_numpy()
+    conds = [
+        (R >= 4) & (F >= 4) & (M >= 4),
+        (R >= 3) & (F >= 3),
+        (R >= 4) & (F <= 2),
+        (R <= 2) & (F >= 3),
+        (R <= 2) & (F <= 2) & (M <= 2),
+        (R >= 3) & (M >= 4),
+    ]
+    labels = ['Champions', 'Loyal Customers', 'New Customers', 'At Risk', 'Hibernating', 'Big Spenders']
+    rfm['Segment'] = pd.Categorical(np.select(conds, labels, default='Need Attention'))
+    
+    return rfm
+
+
+def analysis_rfm(rfm: pd.DataFrame):
     """
     BUSINESS QUESTION: How can we segment customers by value and engagement?
     STRATEGIC VALUE: RFM is the gold-standard for customer segmentation in
@@ -276,43 +411,9 @@ def analysis_rfm(df: pd.DataFrame) -> pd.DataFrame:
     """
     print("\n─── Analysis 6: RFM Analysis ───")
     
-    snapshot_date = df['InvoiceDate'].max() + pd.Timedelta(days=1)
-    
-    rfm = df.groupby('Customer ID').agg({
-        'InvoiceDate': lambda x: (snapshot_date - x.max()).days,  # Recency
-        'Invoice': 'nunique',                                      # Frequency
-        'Revenue': 'sum'                                           # Monetary
-    }).reset_index()
-    rfm.columns = ['CustomerID', 'Recency', 'Frequency', 'Monetary']
-    
-    # Score each dimension 1–5 (quintiles)
-    rfm['R_Score'] = pd.qcut(rfm['Recency'], 5, labels=[5, 4, 3, 2, 1]).astype(int)
-    rfm['F_Score'] = pd.qcut(rfm['Frequency'].rank(method='first'), 5, labels=[1, 2, 3, 4, 5]).astype(int)
-    rfm['M_Score'] = pd.qcut(rfm['Monetary'].rank(method='first'), 5, labels=[1, 2, 3, 4, 5]).astype(int)
-    rfm['RFM_Score'] = rfm['R_Score'].astype(str) + rfm['F_Score'].astype(str) + rfm['M_Score'].astype(str)
-    
-    # Segment mapping
-    def rfm_segment(row):
-        if row['R_Score'] >= 4 and row['F_Score'] >= 4 and row['M_Score'] >= 4:
-            return 'Champions'
-        elif row['R_Score'] >= 3 and row['F_Score'] >= 3:
-            return 'Loyal Customers'
-        elif row['R_Score'] >= 4 and row['F_Score'] <= 2:
-            return 'New Customers'
-        elif row['R_Score'] <= 2 and row['F_Score'] >= 3:
-            return 'At Risk'
-        elif row['R_Score'] <= 2 and row['F_Score'] <= 2 and row['M_Score'] <= 2:
-            return 'Hibernating'
-        elif row['R_Score'] >= 3 and row['M_Score'] >= 4:
-            return 'Big Spenders'
-        else:
-            return 'Need Attention'
-    
-    rfm['Segment'] = rfm.apply(rfm_segment, axis=1)
-    
     # ── Visualization 1: Segment Distribution ──
     seg_counts = rfm['Segment'].value_counts()
-    seg_revenue = rfm.groupby('Segment')['Monetary'].sum().reindex(seg_counts.index)
+    seg_revenue = rfm.groupby('Segment', observed=True, sort=False)['Monetary'].sum().reindex(seg_counts.index)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
     
@@ -345,7 +446,8 @@ def analysis_rfm(df: pd.DataFrame) -> pd.DataFrame:
     ax.set_xlabel('Recency (days since last purchase)')
     ax.set_ylabel('Frequency (number of orders)')
     plt.tight_layout()
-    savefig('07_rfm_scatter')
+    # Thousands of overlapping markers: 100 dpi is plenty and much cheaper to render
+    savefig('07_rfm_scatter', dpi=100)
     
     # Print summary
     champs = rfm[rfm['Segment'] == 'Champions']
@@ -354,8 +456,6 @@ def analysis_rfm(df: pd.DataFrame) -> pd.DataFrame:
     print(f"  At Risk:   {len(at_risk)} customers ({len(at_risk)/len(rfm)*100:.1f}%) → £{at_risk['Monetary'].sum():,.0f} revenue")
     print(f"  💡 Interpretation: Champions are the core profit engine. At-Risk customers need immediate attention.")
     print(f"  📌 Recommendation: Launch VIP loyalty program for Champions; trigger win-back emails for At-Risk.")
-    
-    return rfm
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -368,11 +468,14 @@ def analysis_top_products(df: pd.DataFrame):
     """
     print("\n─── Analysis 7: Top 10 Products by Revenue ───")
     
-    products = df.groupby(['StockCode', 'Description']).agg(
-        TotalRevenue=('Revenue', 'sum'),
-        UnitsSold=('Quantity', 'sum'),
-        OrderCount=('Invoice', 'nunique')
-    ).reset_index().sort_values('TotalRevenue', ascending=False).head(10)
+    keys = ['StockCode', 'Description']
+    products = (df.groupby(keys, observed=True, sort=False)[['Revenue', 'Quantity']].sum()
+                .rename(columns={'Revenue': 'TotalRevenue', 'Quantity': 'UnitsSold'})
+                .nlargest(10, 'TotalRevenue'))
+    # Distinct orders only for the ten products shown, not the whole catalogue
+    top_rows = df[df['StockCode'].isin(products.index.get_level_values('StockCode'))]
+    products['OrderCount'] = top_rows.groupby(keys, observed=True, sort=False)['InvoiceCode'].nunique()
+    products = products.reset_index()
     
     # Truncate long descriptions
     products['ShortDesc'] = products['Description'].str[:35]
@@ -381,9 +484,7 @@ def analysis_top_products(df: pd.DataFrame):
     bars = ax.barh(products['ShortDesc'][::-1], products['TotalRevenue'][::-1],
                    color=PALETTE[0], edgecolor='white')
     
-    for bar, val in zip(bars, products['TotalRevenue'][::-1]):
-        ax.text(bar.get_width() + products['TotalRevenue'].max()*0.01, bar.get_y() + bar.get_height()/2,
-                f'£{val:,.0f}', ha='left', va='center', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, fmt='£{:,.0f}', padding=3, fontsize=10, fontweight='bold')
     
     ax.set_title('Top 10 Products by Revenue', fontsize=16, pad=15)
     ax.set_xlabel('Total Revenue (£)')
@@ -407,10 +508,10 @@ def analysis_top_countries(df: pd.DataFrame):
     """
     print("\n─── Analysis 8: Top 10 Countries by Revenue ───")
     
-    countries = df.groupby('Country').agg(
+    countries = df.groupby('Country', observed=True, sort=False).agg(
         TotalRevenue=('Revenue', 'sum'),
         Customers=('Customer ID', 'nunique'),
-        Orders=('Invoice', 'nunique')
+        Orders=('InvoiceCode', 'nunique')
     ).reset_index().sort_values('TotalRevenue', ascending=False)
     
     # Separate UK from rest for context
@@ -426,9 +527,7 @@ def analysis_top_countries(df: pd.DataFrame):
     bars = ax.barh(top10['Country'][::-1], top10['TotalRevenue'][::-1],
                    color=colors[::-1], edgecolor='white')
     
-    for bar, val in zip(bars, top10['TotalRevenue'][::-1]):
-        ax.text(bar.get_width() + total_rev*0.005, bar.get_y() + bar.get_height()/2,
-                f'£{val:,.0f}', ha='left', va='center', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, fmt='£{:,.0f}', padding=3, fontsize=10, fontweight='bold')
     
     ax.set_title('Top 10 Countries by Revenue', fontsize=16, pad=15)
     ax.set_xlabel('Total Revenue (£)')
@@ -445,18 +544,16 @@ def analysis_top_countries(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 9: Revenue by Hour of Day
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_revenue_by_hour(df: pd.DataFrame):
+def analysis_revenue_by_hour(hourly: pd.Series, peak_hours: list):
     """
     BUSINESS QUESTION: When do customers buy the most?
     STRATEGIC VALUE: Optimizes ad scheduling, email send times, and server capacity.
     """
     print("\n─── Analysis 9: Revenue by Hour of Day ───")
     
-    hourly = df.groupby('Hour')['Revenue'].sum().reset_index()
-    
     fig, ax = plt.subplots(figsize=(12, 6))
-    colors = [PALETTE[3] if h in hourly.nlargest(3, 'Revenue')['Hour'].values else PALETTE[0] for h in hourly['Hour']]
-    ax.bar(hourly['Hour'], hourly['Revenue'], color=colors, width=0.7, edgecolor='white')
+    colors = np.where(np.isin(hourly.index, peak_hours), PALETTE[3], PALETTE[0])
+    ax.bar(hourly.index, hourly.values, color=colors, width=0.7, edgecolor='white')
     
     ax.set_xticks(range(0, 24))
     ax.set_xticklabels([f'{h}:00' for h in range(24)], rotation=45, ha='right', fontsize=9)
@@ -467,7 +564,6 @@ def analysis_revenue_by_hour(df: pd.DataFrame):
     plt.tight_layout()
     savefig('10_revenue_by_hour')
     
-    peak_hours = hourly.nlargest(3, 'Revenue')['Hour'].tolist()
     print(f"  💡 Interpretation: Peak buying hours: {peak_hours}")
     print(f"  📌 Recommendation: Schedule email campaigns and flash sales during peak hours.")
 
@@ -475,17 +571,15 @@ def analysis_revenue_by_hour(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 10: Average Order Value Trend
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_aov_trend(df: pd.DataFrame):
+def analysis_aov_trend(order_rev: pd.Series):
     """
     BUSINESS QUESTION: Is the average basket size improving?
     STRATEGIC VALUE: AOV growth without acquisition growth = higher profitability.
     """
     print("\n─── Analysis 10: Average Order Value (AOV) Trend ───")
     
-    order_rev = df.groupby(['YearMonth', 'Invoice'])['Revenue'].sum().reset_index()
-    aov = order_rev.groupby('YearMonth')['Revenue'].mean().reset_index()
+    aov = order_rev.groupby(level='YearMonth', observed=True, sort=False).mean().sort_index().reset_index()
     aov.columns = ['YearMonth', 'AOV']
-    aov = aov.sort_values('YearMonth')
     
     fig, ax = plt.subplots(figsize=(14, 6))
     ax.plot(range(len(aov)), aov['AOV'], color=PALETTE[1], linewidth=2.5, marker='s', markersize=5)
@@ -496,7 +590,7 @@ def analysis_aov_trend(df: pd.DataFrame):
                label=f'Overall Avg: £{overall_aov:.2f}')
     
     ax.set_xticks(range(len(aov)))
-    ax.set_xticklabels(aov['YearMonth'], rotation=45, ha='right', fontsize=9)
+    ax.set_xticklabels(aov['YearMonth'].astype(str), rotation=45, ha='right', fontsize=9)
     ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
     ax.set_title('Average Order Value (AOV) Trend', fontsize=16, pad=15)
     ax.set_xlabel('Month')
@@ -512,23 +606,18 @@ def analysis_aov_trend(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # ANALYSIS 11: Day-of-Week Revenue Pattern
 # ═══════════════════════════════════════════════════════════════════════════
-def analysis_day_of_week(df: pd.DataFrame):
+def analysis_day_of_week(daily: pd.Series, best_day: str):
     """
     BUSINESS QUESTION: Which days generate the most revenue?
     STRATEGIC VALUE: Optimizes staffing, ad spend, and operational readiness.
     """
     print("\n─── Analysis 11: Revenue by Day of Week ───")
     
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    daily = df.groupby('DayOfWeek')['Revenue'].sum().reindex(day_order).reset_index()
-    
     fig, ax = plt.subplots(figsize=(10, 6))
-    colors = [PALETTE[3] if v == daily['Revenue'].max() else PALETTE[0] for v in daily['Revenue']]
-    bars = ax.bar(daily['DayOfWeek'], daily['Revenue'], color=colors, width=0.6, edgecolor='white')
+    colors = np.where(daily.to_numpy() == daily.max(), PALETTE[3], PALETTE[0])
+    bars = ax.bar(daily.index, daily.values, color=colors, width=0.6, edgecolor='white')
     
-    for bar, val in zip(bars, daily['Revenue']):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + daily['Revenue'].max()*0.01,
-                f'£{val:,.0f}', ha='center', va='bottom', fontsize=9, fontweight='bold')
+    ax.bar_label(bars, fmt='£{:,.0f}', padding=3, fontsize=9, fontweight='bold')
     
     ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'£{x:,.0f}'))
     ax.set_title('Revenue by Day of Week', fontsize=16, pad=15)
@@ -536,7 +625,6 @@ def analysis_day_of_week(df: pd.DataFrame):
     plt.tight_layout()
     savefig('12_day_of_week_revenue')
     
-    best_day = daily.loc[daily['Revenue'].idxmax(), 'DayOfWeek']
     print(f"  💡 Interpretation: {best_day} is the highest-revenue day.")
     print(f"  📌 Recommendation: Launch weekly promotions on the slowest day to balance demand.")
 
@@ -544,26 +632,29 @@ def analysis_day_of_week(df: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # KPI SUMMARY TABLE
 # ═══════════════════════════════════════════════════════════════════════════
-def generate_kpi_summary(df: pd.DataFrame, rfm: pd.DataFrame):
+def generate_kpi_summary(df: pd.DataFrame, rfm: pd.DataFrame, monthly: pd.Series):
     """Generate a summary of all headline KPIs."""
     print("\n" + "=" * 60)
     print("📊 HEADLINE KPI SUMMARY")
     print("=" * 60)
     
+    # Orders per customer: every invoice belongs to one customer, so bin each invoice's
+    # first row by Customer ID (small positive ints) and keep the non-empty bins
+    first_rows = ~df['InvoiceCode'].duplicated().to_numpy()
+    purchase_counts = np.bincount(df['Customer ID'].to_numpy()[first_rows])
+    purchase_counts = purchase_counts[purchase_counts > 0]
+    
     total_revenue = df['Revenue'].sum()
-    total_orders = df['Invoice'].nunique()
-    total_customers = df['Customer ID'].nunique()
+    total_orders = df.attrs['n_invoices']
+    total_customers = len(purchase_counts)
     aov = total_revenue / total_orders
-    avg_items_per_order = df.groupby('Invoice')['Quantity'].sum().mean()
+    avg_items_per_order = np.bincount(df['InvoiceCode'].to_numpy(), weights=df['Quantity'].to_numpy()).mean()
     
     # Monthly growth
-    monthly = df.groupby('YearMonth')['Revenue'].sum().sort_index()
-    growth_rates = monthly.pct_change().dropna() * 100
-    avg_growth = growth_rates.mean()
+    _, avg_growth, _ = growth_stats(monthly.to_numpy())
     
     # Repeat customer rate
-    purchase_counts = df.groupby('Customer ID')['Invoice'].nunique()
-    repeat_rate = (purchase_counts > 1).sum() / len(purchase_counts) * 100
+    repeat_rate = (purchase_counts > 1).mean() * 100
     
     # Champions share
     champs = rfm[rfm['Segment'] == 'Champions']
@@ -592,27 +683,67 @@ def generate_kpi_summary(df: pd.DataFrame, rfm: pd.DataFrame):
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN EXECUTION
 # ═══════════════════════════════════════════════════════════════════════════
+@memory.cache(ignore=['df'])
+def cached_tables(data_key: tuple, df: pd.DataFrame) -> tuple:
+    """precompute_aggregates(df) and build_rfm(df), memoized on disk under data_key.
+
+    df is left out of the cache key (hashing it costs as much as the work saved);
+    data_key identifies the input file and this script's version instead.
+    """
+    return precompute_aggregates(df), build_rfm(df)
+
+
+def run_captured(func, *args) -> str:
+    """Run one analysis and return what it printed, so reports can be replayed in order."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        func(*args)
+    return buf.getvalue()
+
+
 def main():
     df = load_data()
+    # Aggregates and the RFM table only change with the data (or this code), so repeat
+    # runs read them back from data/cache and just redraw the charts
+    data_key = (os.path.getmtime(DATA_PATH), os.path.getsize(DATA_PATH), os.path.getmtime(__file__))
+    agg, rfm = cached_tables(data_key, df)
+    
+    # The analyses are independent. Those drawn from the small precomputed tables
+    # render in worker processes; the three that need the full transaction frame run
+    # here afterwards, so df is never pickled out to a worker. The multiprocessing
+    # backend starts workers from this module (fork, or a spawn that re-imports it),
+    # so they keep the Agg backend and the style settings above
+    pooled = {
+        0: (analysis_monthly_revenue, agg['monthly'], agg['monthly_peak_pos']),
+        1: (analysis_quarterly_revenue, agg['quarterly'], agg['quarterly_top']),
+        2: (analysis_yoy_comparison, agg['yoy']),
+        3: (analysis_monthly_growth_rate, agg['monthly']),
+        5: (analysis_rfm, rfm),
+        8: (analysis_revenue_by_hour, agg['hourly'], agg['hourly_top3']),
+        9: (analysis_aov_trend, agg['order_rev']),
+        10: (analysis_day_of_week, agg['daily'], agg['daily_top']),
+    }
+    local = {
+        4: (analysis_cohort_retention, df),
+        6: (analysis_top_products, df),
+        7: (analysis_top_countries, df),
+    }
+    pool_reports = Parallel(n_jobs=-1, backend='multiprocessing')(
+        delayed(run_captured)(*task) for task in pooled.values())
+    reports = dict(zip(pooled, pool_reports))
+    reports.update((i, run_captured(*task)) for i, task in local.items())
+    # Print in analysis order (1–11), whichever process drew the chart
+    for i in sorted(reports):
+        print(reports[i], end='')
     
-    analysis_monthly_revenue(df)
-    analysis_quarterly_revenue(df)
-    analysis_yoy_comparison(df)
-    analysis_monthly_growth_rate(df)
-    analysis_cohort_retention(df)
-    rfm = analysis_rfm(df)
-    analysis_top_products(df)
-    analysis_top_countries(df)
-    analysis_revenue_by_hour(df)
-    analysis_aov_trend(df)
-    analysis_day_of_week(df)
-    
-    kpis = generate_kpi_summary(df, rfm)
+    kpis = generate_kpi_summary(df, rfm, agg['monthly'])
     
     # Save RFM data for advanced analytics
     rfm_path = os.path.join(BASE_DIR, '..', 'data', 'cleaned', 'rfm_data.csv')
     rfm.to_csv(rfm_path, index=False)
-    print(f"\nRFM data saved → data/cleaned/rfm_data.csv")
+    # Keep the Parquet copy in step so loaders that prefer it never see a stale table
+    rfm.to_parquet(rfm_path.replace('.csv', '.parquet'), engine='pyarrow', compression='snappy', index=False)
+    print(f"\nRFM data saved → data/cleaned/rfm_data.csv (+ .parquet)")
     
     print("\n✅ All 12 charts saved to outputs/figures/")
     print("✅ Phase 3 complete!")